@@ -1,4 +1,7 @@
-import copy
+import atexit
+import hashlib
+import html as html_module
+import io
 import json
 import os
 import queue
@@ -7,18 +10,43 @@ import subprocess
 import sys
 import threading
 import time
+import tkinter as tk
+import zipfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime
+from difflib import SequenceMatcher
+from functools import lru_cache
 from pathlib import Path
+from tkinter import filedialog, messagebox, ttk
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from xml.etree import ElementTree
 
 import pdfplumber
 import requests
 import yaml
 from docx import Document
-from difflib import HtmlDiff, SequenceMatcher
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+from requests.adapters import HTTPAdapter
+
+try:
+    # El binding C de libyaml parsea 10-50x más rápido que el loader puro Python.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    # orjson serializa dicts con muchas cadenas 3-10x más rápido que json.
+    # Opcional: con la biblioteca estándar el comportamiento es idéntico.
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def dumps_json_line(obj: Any) -> str:
+    if _orjson is not None:
+        return _orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
 
 
 # ==========================
@@ -52,6 +80,10 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "max_retries": 2,
         "retry_backoff_seconds": 2.0,
         "abort_on_failure": False,
+        "concurrency": 4,
+        "chunk_batch_size": 1,
+        "diff_report": "auto",
+        "diff_report_max_chars": 500_000,
     },
 }
 
@@ -72,24 +104,33 @@ ENV_OVERRIDE_MAP: Dict[str, Tuple[Sequence[str], Callable[[str], Any]]] = {
     "MAX_RETRIES": (("runtime", "max_retries"), int),
     "RETRY_BACKOFF_SECONDS": (("runtime", "retry_backoff_seconds"), float),
     "ABORT_ON_FAILURE": (("runtime", "abort_on_failure"), lambda v: v.lower() in {"1", "true", "yes"}),
+    "LM_CONCURRENCY": (("runtime", "concurrency"), int),
+    "LM_CHUNK_BATCH": (("runtime", "chunk_batch_size"), int),
+    "DIFF_REPORT": (("runtime", "diff_report"), str),
+    "DIFF_REPORT_MAX_CHARS": (("runtime", "diff_report_max_chars"), int),
 }
 
 
 def deep_update(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
-    for key, value in overrides.items():
-        if isinstance(value, dict) and isinstance(base.get(key), dict):
-            deep_update(base[key], value)
-        else:
-            base[key] = value
+    stack: List[Tuple[Dict[str, Any], Dict[str, Any]]] = [(base, overrides)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            if isinstance(value, dict) and isinstance(target.get(key), dict):
+                stack.append((target[key], value))
+            else:
+                target[key] = value
     return base
 
 
 def load_config(config_path: Path) -> Dict[str, Any]:
-    config = copy.deepcopy(DEFAULT_CONFIG)
+    # Copia profunda de DEFAULT_CONFIG vía JSON: más rápido que copy.deepcopy
+    # para un dict chico de escalares y listas.
+    config = json.loads(json.dumps(DEFAULT_CONFIG))
 
     if config_path.exists():
         with open(config_path, "r", encoding="utf-8") as cfg_file:
-            user_config = yaml.safe_load(cfg_file) or {}
+            user_config = yaml.load(cfg_file, Loader=_YamlLoader) or {}
         deep_update(config, user_config)
 
     for env_key, (path, caster) in ENV_OVERRIDE_MAP.items():
@@ -144,8 +185,17 @@ class RunLogger:
         self.log_file = self.logs_dir / f"run_{run_id}.jsonl"
         self.summary_file = self.logs_dir / f"run_summary_{run_id}.json"
         self._chunk_entries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        # El handle queda abierto durante toda la corrida: abrir/cerrar el
+        # archivo por entrada serializa los chunks paralelos detrás del FS.
+        self._log_fp = self.log_file.open("a", encoding="utf-8", buffering=1 << 16)
+        atexit.register(self.close)
         self.ui_callback = ui_callback
 
+    def close(self) -> None:
+        if not self._log_fp.closed:
+            self._log_fp.close()
+
     def log_console(self, message: str, level: str = "INFO") -> None:
         line = f"[{timestamp_now()}] [{level}] {message}"
         print(line)
@@ -154,18 +204,29 @@ class RunLogger:
 
     def log_chunk(self, entry: Dict[str, Any]) -> None:
         entry_with_ts = {"timestamp": datetime.now().isoformat(), **entry}
-        self._chunk_entries.append(entry_with_ts)
-        with open(self.log_file, "a", encoding="utf-8") as logf:
-            logf.write(json.dumps(entry_with_ts, ensure_ascii=False) + "\n")
+        with self._lock:
+            self._chunk_entries.append(entry_with_ts)
+            self._log_fp.write(dumps_json_line(entry_with_ts) + "\n")
 
     def finalize(self, summary: Dict[str, Any]) -> None:
+        with self._lock:
+            # La corrida terminó: cerrar el handle libera el descriptor (la
+            # GUI crea un RunLogger por corrida) y desregistrar el atexit
+            # suelta la última referencia al logger — con debug activo
+            # _chunk_entries retiene el texto completo de cada chunk. El
+            # atexit queda como red sólo para corridas interrumpidas.
+            self.close()
+            atexit.unregister(self.close)
         summary_with_ts = {
             "timestamp": datetime.now().isoformat(),
             "chunks": self._chunk_entries,
             **summary,
         }
-        with open(self.summary_file, "w", encoding="utf-8") as summary_file:
-            json.dump(summary_with_ts, summary_file, ensure_ascii=False, indent=2)
+        if _orjson is not None:
+            self.summary_file.write_bytes(_orjson.dumps(summary_with_ts, option=_orjson.OPT_INDENT_2))
+        else:
+            with open(self.summary_file, "w", encoding="utf-8") as summary_file:
+                json.dump(summary_with_ts, summary_file, ensure_ascii=False, indent=2)
 
 
 class LMStudioClient:
@@ -178,6 +239,8 @@ class LMStudioClient:
         logger: RunLogger,
         max_retries: int,
         backoff_seconds: float,
+        pool_size: int = 8,
+        response_cache_dir: Optional[Path] = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
@@ -188,30 +251,49 @@ class LMStudioClient:
         self.inference_params["top_k"] = 1
         if "repeat_penalty" not in self.inference_params:
             self.inference_params["repeat_penalty"] = 1.0
+        # La parte inmutable del payload se arma una sola vez; _chat_payload
+        # únicamente agrega los mensajes de cada llamada.
+        self._payload_template: Dict[str, Any] = {"model": model, **self.inference_params}
+        if "stop_sequences" in self._payload_template:
+            self._payload_template["stop"] = self._payload_template.pop("stop_sequences")
+        # Digest de los parámetros efectivos de generación (modelo incluido):
+        # repeat_penalty, max_tokens o stop también cambian la respuesta, así
+        # que forman parte de toda clave de caché.
+        self.payload_digest = hashlib.sha256(
+            json.dumps(self._payload_template, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
         self.logger = logger
         self.max_retries = max_retries
         self.backoff_seconds = backoff_seconds
+        # Con temperature=0 la respuesta es determinista para unos mismos
+        # (parámetros de generación, system, user), así que se puede cachear
+        # en disco y evitar la inferencia al reprocesar un documento sin cambios.
+        self.response_cache_dir = response_cache_dir
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
 
     def _chat_payload(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
-        payload = {
-            "model": self.model,
+        return {
+            **self._payload_template,
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
         }
-        payload.update(self.inference_params)
-        if "stop_sequences" in payload:
-            payload["stop"] = payload.pop("stop_sequences")
-        return payload
 
     def check_health(self) -> None:
         try:
-            response = requests.get(f"{self.base_url}/models", headers=self.headers, timeout=10)
+            response = self.session.get(f"{self.base_url}/models", timeout=10)
             response.raise_for_status()
         except requests.RequestException as exc:
             raise ConnectionError(
@@ -219,26 +301,48 @@ class LMStudioClient:
                 "Asegúrate de que está en ejecución y el endpoint es correcto."
             ) from exc
 
+    def _response_cache_path(self, system_prompt: str, user_prompt: str) -> Path:
+        digest = hashlib.sha256(
+            "\x00".join((self.payload_digest, system_prompt, user_prompt)).encode("utf-8")
+        ).hexdigest()
+        return self.response_cache_dir / f"{digest}.txt"
+
     def generate(self, system_prompt: str, user_prompt: str) -> str:
+        cache_path: Optional[Path] = None
+        if self.response_cache_dir is not None:
+            cache_path = self._response_cache_path(system_prompt, user_prompt)
+            cached = load_cached_text(cache_path)
+            if cached is not None and cached.strip():
+                return cached
+
         payload = self._chat_payload(system_prompt, user_prompt)
+        # Modo streaming (SSE): cada delta se parsea a medida que llega, con
+        # lo que el costo de parseo queda solapado con la propia generación y
+        # el timeout de lectura aplica entre tokens y no a la respuesta entera.
+        payload["stream"] = True
         last_error: Optional[Exception] = None
 
         for attempt in range(self.max_retries + 1):
             try:
-                response = requests.post(
+                with self.session.post(
                     f"{self.base_url}/chat/completions",
-                    headers=self.headers,
                     json=payload,
                     timeout=120,
-                )
-                response.raise_for_status()
-                data = response.json()
+                    stream=True,
+                ) as response:
+                    response.raise_for_status()
+                    # requests asume ISO-8859-1 para text/event-stream sin
+                    # charset; el servidor emite UTF-8, y sin esto los
+                    # acentos llegarían mojibakeados a iter_lines.
+                    response.encoding = "utf-8"
+                    content = self._consume_stream(response)
 
-                if not data.get("choices"):
-                    raise ValueError("La respuesta del servidor no contiene 'choices'.")
-
-                content = data["choices"][0]["message"]["content"]
                 if content and content.strip():
+                    if cache_path is not None:
+                        try:
+                            store_cached_text(cache_path, content)
+                        except OSError:
+                            pass
                     return content
                 raise ValueError("La respuesta del modelo está vacía o sólo contiene espacios.")
 
@@ -257,24 +361,56 @@ class LMStudioClient:
         assert last_error is not None
         raise RuntimeError(f"No se pudo obtener respuesta del modelo tras varios intentos: {last_error}") from last_error
 
+    @staticmethod
+    def _consume_stream(response: "requests.Response") -> str:
+        # orjson parsea cada evento bastante más rápido que el json de la
+        # stdlib; los deltas llegan como líneas SSE "data: {...}".
+        loads = _orjson.loads if _orjson is not None else json.loads
+        parts: List[str] = []
+        saw_event = False
 
-@dataclass
-class TokenSpan:
-    token: str
-    start: int
-    end: int
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data_str = line[5:].strip()
+            if data_str == "[DONE]":
+                break
+            event = loads(data_str)
+            saw_event = True
+            choices = event.get("choices")
+            if not choices:
+                continue
+            delta = choices[0].get("delta") or {}
+            piece = delta.get("content")
+            if piece:
+                parts.append(piece)
 
+        if not saw_event:
+            raise ValueError("La respuesta del servidor no contiene eventos de streaming.")
+        return "".join(parts)
 
-@dataclass
+
+# repr=False: el repr generado incluiría el documento completo vía `source`.
+@dataclass(repr=False)
 class Chunk:
+    # __slots__ explícito (en lugar de @dataclass(slots=True)) para mantener
+    # compatibilidad con Python 3.9; ahorra el __dict__ por instancia.
+    __slots__ = ("index", "total", "source", "char_start", "char_end", "token_start", "token_end")
+
     index: int
     total: int
-    text: str
+    # Referencia al texto completo del documento; todos los chunks comparten
+    # la misma cadena y el texto propio se materializa recién al usarse.
+    source: str
     char_start: int
     char_end: int
     token_start: int
     token_end: int
 
+    @property
+    def text(self) -> str:
+        return self.source[self.char_start:self.char_end]
+
     @property
     def token_length(self) -> int:
         return self.token_end - self.token_start
@@ -287,47 +423,260 @@ class Chunk:
 # ==========================
 # 2. EXTRACCIÓN DE TEXTO
 # ==========================
+# Por debajo de este número de páginas no compensa levantar procesos auxiliares.
+MIN_PAGES_FOR_PARALLEL_PDF = 8
+
+# Umbrales para detectar páginas escaneadas o dominadas por gráficos: mucho
+# peso en streams (raster en XObjects de imagen, o un content stream enorme
+# de dibujo vectorial) con una proporción ínfima de caracteres de texto.
+SCANNED_PAGE_MIN_STREAM_BYTES = 500_000
+SCANNED_PAGE_MAX_CHAR_RATIO = 1e-4
+
+
+def _stream_length(obj: Any, resolve1: Callable[[Any], Any]) -> int:
+    # El Length del diccionario del stream da el tamaño en crudo sin
+    # descomprimir los datos.
+    try:
+        return int(resolve1(resolve1(obj).attrs.get("Length")) or 0)
+    except Exception:
+        return 0
+
+
+def _page_heavy_bytes(page: Any) -> int:
+    """Bytes declarados del content stream más los XObjects de imagen de la página.
+
+    En una página escaneada el raster vive en los XObjects y el content stream
+    es mínimo ("q /Im0 Do Q"); en una de dibujo vectorial es al revés. Se
+    suman ambos para cubrir los dos casos sin descomprimir nada.
+    """
+    try:
+        from pdfminer.pdftypes import resolve1
+
+        total = 0
+        contents = resolve1(page.page_obj.attrs.get("Contents"))
+        if contents is not None:
+            if not isinstance(contents, list):
+                contents = [contents]
+            total += sum(_stream_length(stream, resolve1) for stream in contents)
+
+        resources = resolve1(page.page_obj.attrs.get("Resources")) or {}
+        xobjects = resolve1(resources.get("XObject")) or {}
+        for xobject in xobjects.values():
+            stream = resolve1(xobject)
+            if getattr(stream.attrs.get("Subtype"), "name", None) == "Image":
+                total += _stream_length(stream, resolve1)
+        return total
+    except Exception:
+        return 0
+
+
+def _page_text(page: Any) -> str:
+    heavy_bytes = _page_heavy_bytes(page)
+    if heavy_bytes > SCANNED_PAGE_MIN_STREAM_BYTES:
+        # page.chars interpreta la página completa, pero ese costo sólo se
+        # paga en páginas ya sospechosas por el peso de sus streams.
+        if len(page.chars) / heavy_bytes < SCANNED_PAGE_MAX_CHAR_RATIO:
+            # Página escaneada o de dibujo: procesarla cuesta cientos de ms
+            # y no aporta texto útil.
+            return ""
+    return page.extract_text() or ""
+
+
+def _extract_pdf_page_range(file_path: str, first_page: int, last_page: int) -> List[str]:
+    """Extrae el texto de un rango de páginas (1-indexado, inclusivo). Corre en un proceso hijo."""
+    with pdfplumber.open(file_path, pages=list(range(first_page, last_page + 1))) as pdf:
+        return [_page_text(page) for page in pdf.pages]
+
+
 def extract_text_from_pdf(file_path: Path) -> str:
+    # Se acumula en un StringIO en lugar de lista + "\n".join para que en
+    # memoria sólo viva el texto de la página en curso además del buffer.
+    buffer = io.StringIO()
+
+    def _append_page(page_text: str) -> None:
+        if not page_text:
+            return
+        if buffer.tell():
+            buffer.write("\n")
+        buffer.write(page_text)
+
     with pdfplumber.open(str(file_path)) as pdf:
-        pages_text = []
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                pages_text.append(page_text)
-    return "\n".join(pages_text)
+        page_count = len(pdf.pages)
+        if page_count < MIN_PAGES_FOR_PARALLEL_PDF:
+            for page in pdf.pages:
+                _append_page(_page_text(page))
+            return buffer.getvalue()
+
+    workers = min(os.cpu_count() or 1, page_count)
+    pages_per_worker = -(-page_count // workers)
+    ranges = [
+        (first, min(first + pages_per_worker - 1, page_count))
+        for first in range(1, page_count + 1, pages_per_worker)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for range_texts in executor.map(
+            _extract_pdf_page_range,
+            [str(file_path)] * len(ranges),
+            [first for first, _ in ranges],
+            [last for _, last in ranges],
+        ):
+            for page_text in range_texts:
+                _append_page(page_text)
+
+    return buffer.getvalue()
+
+
+# Namespace principal de WordprocessingML dentro de word/document.xml.
+_DOCX_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
 
 
 def extract_text_from_docx(file_path: Path) -> str:
-    doc = Document(str(file_path))
-    return "\n".join(para.text for para in doc.paragraphs)
+    # Leer word/document.xml directamente con iterparse evita construir el
+    # modelo de objetos de python-docx (un Paragraph/Run por nodo); la
+    # extracción queda ligada al parser C de expat en lugar de a Python.
+    try:
+        with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as doc_xml:
+            paragraphs: List[str] = []
+            runs: List[str] = []
+            for _event, element in ElementTree.iterparse(doc_xml):
+                tag = element.tag
+                if tag == _DOCX_NS + "t":
+                    if element.text:
+                        runs.append(element.text)
+                elif tag == _DOCX_NS + "tab":
+                    runs.append("\t")
+                elif tag in (_DOCX_NS + "br", _DOCX_NS + "cr"):
+                    runs.append("\n")
+                elif tag == _DOCX_NS + "p":
+                    paragraphs.append("".join(runs))
+                    runs.clear()
+                    element.clear()
+            return "\n".join(paragraphs)
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+        # .doc binarios u OOXML atípicos: se delega en python-docx como antes.
+        doc = Document(str(file_path))
+        return "\n".join(para.text for para in doc.paragraphs)
 
 
 # ==========================
-# 3. TOKENIZACIÓN Y TROCEO
+# 2b. CACHÉ DE EXTRACCIÓN
 # ==========================
-TOKEN_PATTERN = re.compile(r"\S+\s*")
+def file_sha256(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as source:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
 
-def tokenize_with_spans(text: str) -> List[TokenSpan]:
-    spans: List[TokenSpan] = []
-    cursor = 0
+def chunking_digest(chunk_cfg: Dict[str, Any]) -> str:
+    raw = json.dumps(chunk_cfg, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def anonymization_digest(payload_digest: str, chunk_cfg: Dict[str, Any]) -> str:
+    """Identifica la combinación de parámetros de generación + prompt + chunking que produce un resultado."""
+    raw = "\x00".join((payload_digest, SYSTEM_PROMPT, chunking_digest(chunk_cfg)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def load_cached_text(cache_path: Path) -> Optional[str]:
+    try:
+        return cache_path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def store_cached_text(cache_path: Path, text: str) -> None:
+    # Escritura atómica: varios chunks concurrentes (o instancias de la app)
+    # comparten el directorio de caché, y un write_text directo dejaría ver
+    # archivos truncados a los lectores. El sufijo por pid+hilo evita que dos
+    # escritores pisen el mismo temporal.
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(
+        f"{cache_path.name}.{os.getpid()}-{threading.get_ident()}.tmp"
+    )
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+
+
+def load_cached_chunks(cache_path: Path, text: str) -> Optional[List["Chunk"]]:
+    try:
+        bounds = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not bounds:
+        return None
+    total = len(bounds)
+    return [
+        Chunk(
+            index=position + 1,
+            total=total,
+            source=text,
+            char_start=char_start,
+            char_end=char_end,
+            token_start=token_start,
+            token_end=token_end,
+        )
+        for position, (char_start, char_end, token_start, token_end) in enumerate(bounds)
+    ]
+
+
+def store_cached_chunks(cache_path: Path, chunks: Sequence["Chunk"]) -> None:
+    bounds = [[chunk.char_start, chunk.char_end, chunk.token_start, chunk.token_end] for chunk in chunks]
+    store_cached_text(cache_path, json.dumps(bounds))
+
+
+# ==========================
+# 3. TOKENIZACIÓN Y TROCEO
+# ==========================
+try:
+    # El módulo `regex` escanea texto largo notablemente más rápido que `re`.
+    # Es opcional: si no está instalado se usa el motor de la biblioteca estándar.
+    import regex as _regex
+
+    TOKEN_PATTERN = _regex.compile(r"\s*\S+\s*")
+except ImportError:
+    TOKEN_PATTERN = re.compile(r"\s*\S+\s*")
+
+
+# Memoizar el tokenizado evita repetir la pasada completa cuando el mismo
+# documento se re-chunquea en la misma sesión (p. ej. tras ajustar la config
+# de chunking). maxsize chico porque cada clave retiene el texto completo.
+# Los arrays devueltos se comparten entre llamadas: tratar como de sólo lectura.
+@lru_cache(maxsize=4)
+def tokenize_with_spans(text: str) -> Tuple[array, array]:
+    """Devuelve dos arrays paralelos (inicios, finales) con los offsets de cada token."""
+    # El \s* inicial hace que los matches teselen el texto exactamente (el
+    # espacio previo al primer token queda dentro del primer span), así que
+    # no hace falta tratar huecos ni cola aparte; el único caso especial es
+    # un texto compuesto sólo por espacios.
+    starts = array("q")
+    ends = array("q")
+    starts_append = starts.append
+    ends_append = ends.append
 
     for match in TOKEN_PATTERN.finditer(text):
-        if match.start() > cursor:
-            whitespace_chunk = text[cursor:match.start()]
-            spans.append(TokenSpan(token=whitespace_chunk, start=cursor, end=match.start()))
-        spans.append(TokenSpan(token=match.group(0), start=match.start(), end=match.end()))
-        cursor = match.end()
+        starts_append(match.start())
+        ends_append(match.end())
+
+    if not starts and text:
+        starts_append(0)
+        ends_append(len(text))
 
-    if cursor < len(text):
-        spans.append(TokenSpan(token=text[cursor:], start=cursor, end=len(text)))
+    return starts, ends
 
-    return spans
+
+# Caracteres que cierran una oración; cortar ahí (o en un salto de línea)
+# evita partir una frase entre dos chunks, lo que degrada la anonimización
+# en los bordes.
+_SENTENCE_END_CHARS = (".", ";", "!", "?")
 
 
 def build_chunks(text: str, max_tokens: int, overlap_tokens: int, safety_factor: float) -> List[Chunk]:
-    token_spans = tokenize_with_spans(text)
-    total_tokens = len(token_spans)
+    token_starts, token_ends = tokenize_with_spans(text)
+    total_tokens = len(token_starts)
 
     effective_chunk_tokens = max(1, int(max_tokens * safety_factor))
     if overlap_tokens > 0:
@@ -341,16 +690,24 @@ def build_chunks(text: str, max_tokens: int, overlap_tokens: int, safety_factor:
 
     while token_start < total_tokens:
         token_end = min(token_start + effective_chunk_tokens, total_tokens)
-        chunk_spans = token_spans[token_start:token_end]
-        char_start = chunk_spans[0].start
-        char_end = chunk_spans[-1].end
-        chunk_text = text[char_start:char_end]
+        if token_end < total_tokens:
+            # Se retrocede dentro del último 15% de la ventana buscando un
+            # token que termine párrafo u oración; si no aparece ninguno se
+            # corta en el límite duro, como antes.
+            floor = token_start + max(1, int(effective_chunk_tokens * 0.85))
+            for candidate in range(token_end, floor, -1):
+                tail = text[token_starts[candidate - 1]:token_ends[candidate - 1]]
+                if "\n" in tail or tail.rstrip().endswith(_SENTENCE_END_CHARS):
+                    token_end = candidate
+                    break
+        char_start = token_starts[token_start]
+        char_end = token_ends[token_end - 1]
 
         chunks.append(
             Chunk(
                 index=chunk_index,
                 total=0,
-                text=chunk_text,
+                source=text,
                 char_start=char_start,
                 char_end=char_end,
                 token_start=token_start,
@@ -434,6 +791,46 @@ def build_user_prompt(chunk: Chunk) -> str:
     return chunk.text
 
 
+# Procesar varios chunks por llamada amortiza el prefill del system prompt y
+# la vuelta de red. Es opt-in (runtime.chunk_batch_size > 1) porque depende de
+# que el modelo conserve los delimitadores; si no lo hace, se reprocesa chunk
+# por chunk.
+BATCH_PROMPT_SUFFIX = (
+    "El mensaje del usuario contiene varios fragmentos independientes, cada uno precedido por una "
+    "línea delimitadora '===CHUNK n==='. Anonimiza cada fragmento por separado siguiendo las reglas "
+    "anteriores y devuelve los resultados manteniendo exactamente las mismas líneas delimitadoras, "
+    "en el mismo orden y sin texto adicional."
+)
+
+BATCH_DELIMITER_RE = re.compile(r"^===CHUNK (\d+)===[ \t]*$", re.MULTILINE)
+
+
+def build_batch_user_prompt(batch: Sequence[Chunk]) -> str:
+    return "\n".join(f"===CHUNK {chunk.index}===\n{chunk.text}" for chunk in batch)
+
+
+def split_batch_response(response: str, batch: Sequence[Chunk]) -> Optional[Dict[int, str]]:
+    """Separa la respuesta de un lote por delimitador. Devuelve None si no coincide con lo pedido."""
+    matches = list(BATCH_DELIMITER_RE.finditer(response))
+    if len(matches) != len(batch):
+        return None
+
+    parts: Dict[int, str] = {}
+    for position, match in enumerate(matches):
+        next_start = matches[position + 1].start() if position + 1 < len(matches) else len(response)
+        segment = response[match.end():next_start]
+        # Sólo se descartan los saltos de línea que introduce el propio delimitador.
+        if segment.startswith("\n"):
+            segment = segment[1:]
+        if segment.endswith("\n"):
+            segment = segment[:-1]
+        parts[int(match.group(1))] = segment
+
+    if set(parts) != {chunk.index for chunk in batch}:
+        return None
+    return parts
+
+
 def process_chunks(
     chunks: Sequence[Chunk],
     client: LMStudioClient,
@@ -445,39 +842,45 @@ def process_chunks(
     failed_chunks: List[int] = []
     abort_on_failure = runtime_config.get("abort_on_failure", False)
     debug_mode = runtime_config.get("debug", False)
+    concurrency = max(1, int(runtime_config.get("concurrency", 4)))
+    batch_size = max(1, int(runtime_config.get("chunk_batch_size", 1)))
 
     total = len(chunks)
     if progress_callback:
         progress_callback(0, total)
 
-    for chunk in chunks:
+    def _process_one(chunk: Chunk) -> str:
+        input_length = len(chunk.text)
+        token_length = chunk.token_length
+
         logger.log_console(
             f"Procesando chunk {chunk.index}/{chunk.total} "
-            f"(caracteres: {len(chunk.text)}, tokens ~ {chunk.token_length})."
+            f"(caracteres: {input_length}, tokens ~ {token_length})."
         )
 
         user_prompt = build_user_prompt(chunk)
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         response = ""
 
         try:
             response = client.generate(SYSTEM_PROMPT, user_prompt)
-            duration = time.time() - start_time
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
+            output_length = len(response)
             snippet = response[:120].replace("\n", " ").strip()
 
             logger.log_chunk(
                 {
                     "chunk_index": chunk.index,
                     "total_chunks": chunk.total,
-                    "char_length": len(chunk.text),
-                    "output_char_length": len(response),
-                    "char_delta": len(response) - len(chunk.text),
-                    "length_ratio": round(len(response) / len(chunk.text), 4) if len(chunk.text) else None,
-                    "token_length": chunk.token_length,
+                    "char_length": input_length,
+                    "output_char_length": output_length,
+                    "char_delta": output_length - input_length,
+                    "length_ratio": round(output_length / input_length, 4) if input_length else None,
+                    "token_length": token_length,
                     "duration_seconds": round(duration, 3),
                     "status": "ok",
                     "input_preview": chunk.preview(),
-                    "output_preview": snippet + ("..." if len(response) > 120 else ""),
+                    "output_preview": snippet + ("..." if output_length > 120 else ""),
                 }
             )
 
@@ -492,34 +895,127 @@ def process_chunks(
                     }
                 )
 
-            results[chunk.index - 1] = response
+            return response
 
         except Exception as exc:
-            duration = time.time() - start_time
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
+            output_length = len(response)
             logger.log_console(f"Error en chunk {chunk.index}: {exc}", level="ERROR")
             logger.log_chunk(
                 {
                     "chunk_index": chunk.index,
                     "total_chunks": chunk.total,
-                    "char_length": len(chunk.text),
-                    "output_char_length": len(response),
-                    "char_delta": len(response) - len(chunk.text),
-                    "length_ratio": round(len(response) / len(chunk.text), 4) if len(chunk.text) else None,
-                    "token_length": chunk.token_length,
+                    "char_length": input_length,
+                    "output_char_length": output_length,
+                    "char_delta": output_length - input_length,
+                    "length_ratio": round(output_length / input_length, 4) if input_length else None,
+                    "token_length": token_length,
                     "duration_seconds": round(duration, 3),
                     "status": "error",
                     "error_message": str(exc),
                 }
             )
-            failed_chunks.append(chunk.index)
-            if abort_on_failure:
+            raise
+
+    def _process_batch(group: List[Chunk]) -> Optional[Dict[int, str]]:
+        first_index, last_index = group[0].index, group[-1].index
+        logger.log_console(
+            f"Procesando lote de chunks {first_index}-{last_index} ({len(group)} chunks en una llamada)."
+        )
+
+        start_ns = time.perf_counter_ns()
+        response = client.generate(SYSTEM_PROMPT + "\n\n" + BATCH_PROMPT_SUFFIX, build_batch_user_prompt(group))
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
+
+        parts = split_batch_response(response, group)
+        if parts is None:
+            logger.log_console(
+                f"No se pudo separar la respuesta del lote {first_index}-{last_index}; "
+                "se reprocesa chunk por chunk.",
+                level="WARN",
+            )
+            logger.log_chunk(
+                {
+                    "batch_first_chunk": first_index,
+                    "batch_last_chunk": last_index,
+                    "batch_size": len(group),
+                    "duration_seconds": round(duration, 3),
+                    "status": "batch_split_failed",
+                }
+            )
+            return None
+
+        for chunk in group:
+            output = parts[chunk.index]
+            input_length = len(chunk.text)
+            output_length = len(output)
+            logger.log_chunk(
+                {
+                    "chunk_index": chunk.index,
+                    "total_chunks": chunk.total,
+                    "char_length": input_length,
+                    "output_char_length": output_length,
+                    "char_delta": output_length - input_length,
+                    "length_ratio": round(output_length / input_length, 4) if input_length else None,
+                    "token_length": chunk.token_length,
+                    "duration_seconds": round(duration, 3),
+                    "batch_size": len(group),
+                    "status": "ok",
+                    "input_preview": chunk.preview(),
+                    "output_preview": output[:120].replace("\n", " ").strip()
+                    + ("..." if output_length > 120 else ""),
+                }
+            )
+        return parts
+
+    def _process_group(group: List[Chunk]) -> Tuple[Dict[int, str], List[int]]:
+        group_results: Dict[int, str] = {}
+        group_failed: List[int] = []
+
+        if len(group) > 1:
+            try:
+                batch_results = _process_batch(group)
+            except Exception:
+                if abort_on_failure:
+                    raise
+                return {}, [chunk.index for chunk in group]
+            if batch_results is not None:
+                return batch_results, []
+
+        for chunk in group:
+            try:
+                group_results[chunk.index] = _process_one(chunk)
+            except Exception:
+                group_failed.append(chunk.index)
+                if abort_on_failure:
+                    raise
+        return group_results, group_failed
+
+    groups = [list(chunks[offset:offset + batch_size]) for offset in range(0, total, batch_size)]
+
+    completed = 0
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(groups))) as executor:
+        future_map = {executor.submit(_process_group, group): group for group in groups}
+        for future in as_completed(future_map):
+            group = future_map[future]
+            try:
+                group_results, group_failed = future.result()
+            except Exception:
+                for pending in future_map:
+                    pending.cancel()
                 if progress_callback:
-                    progress_callback(chunk.index, total)
+                    progress_callback(completed + len(group), total)
                 raise
 
-        if progress_callback:
-            progress_callback(chunk.index, total)
+            for index, response in group_results.items():
+                results[index - 1] = response
+            failed_chunks.extend(group_failed)
+
+            completed += len(group)
+            if progress_callback:
+                progress_callback(completed, total)
 
+    failed_chunks.sort()
     return results, failed_chunks
 
 
@@ -531,16 +1027,16 @@ def merge_chunks(chunks: Sequence[Chunk], processed_chunks: Sequence[str]) -> st
         return ""
 
     merged_parts: List[str] = []
-    covered_ranges: List[Tuple[int, int]] = []
+    last_end = -1
 
+    # build_chunks emite los chunks en orden monótono de char_start y sin
+    # solaparse (overlap_tokens debe ser 0), así que alcanza con comparar
+    # contra el final del último rango cubierto.
     for chunk, processed in zip(chunks, processed_chunks):
-        start = chunk.char_start
-        end = chunk.char_end
-
-        if any(not (end <= existing_start or start >= existing_end) for existing_start, existing_end in covered_ranges):
+        if chunk.char_start < last_end:
             continue
 
-        covered_ranges.append((start, end))
+        last_end = chunk.char_end
         merged_parts.append(processed if processed else chunk.text)
 
     return "".join(merged_parts)
@@ -563,24 +1059,106 @@ def calculate_length_metrics(original_text: str, anonymized_text: str) -> Dict[s
     return metrics
 
 
+DIFF_REPORT_HEADER = (
+    "<!DOCTYPE html>\n"
+    "<html lang=\"es\">\n"
+    "<head>\n"
+    "<meta charset=\"utf-8\">\n"
+    "<title>Comparación Original vs Anonimizado</title>\n"
+    "<style>\n"
+    "body { font-family: sans-serif; margin: 1em; }\n"
+    "pre { white-space: pre-wrap; word-wrap: break-word; }\n"
+    "del { background-color: #ffd7d7; text-decoration: line-through; }\n"
+    "ins { background-color: #d7ffd7; text-decoration: none; }\n"
+    "</style>\n"
+    "</head>\n"
+    "<body>\n"
+    "<h2>Original (tachado) vs Anonimizado (resaltado)</h2>\n"
+    "<pre>"
+)
+
+DIFF_REPORT_FOOTER = "</pre>\n</body>\n</html>\n"
+
+# Los segmentos sin cambios pueden medir megabytes; se escriben en rebanadas
+# para no materializar todo el HTML en memoria.
+_DIFF_WRITE_SLICE = 1 << 16
+
+
+def _write_escaped(diff_file, segment: str) -> None:
+    for offset in range(0, len(segment), _DIFF_WRITE_SLICE):
+        diff_file.write(html_module.escape(segment[offset:offset + _DIFF_WRITE_SLICE]))
+
+
 def generate_diff_report(original_text: str, anonymized_text: str, output_path: Path) -> None:
-    html_diff = HtmlDiff(wrapcolumn=80)
-    original_lines = original_text.splitlines()
-    anonymized_lines = anonymized_text.splitlines()
-    diff_html = html_diff.make_file(original_lines, anonymized_lines, "Original", "Anonimizado")
     with open(output_path, "w", encoding="utf-8") as diff_file:
-        diff_file.write(diff_html)
+        diff_file.write(DIFF_REPORT_HEADER)
+        for tag, i1, i2, j1, j2 in diff_opcodes(original_text, anonymized_text):
+            if tag == "equal":
+                _write_escaped(diff_file, original_text[i1:i2])
+                continue
+            if i1 < i2:
+                diff_file.write("<del>")
+                _write_escaped(diff_file, original_text[i1:i2])
+                diff_file.write("</del>")
+            if j1 < j2:
+                diff_file.write("<ins>")
+                _write_escaped(diff_file, anonymized_text[j1:j2])
+                diff_file.write("</ins>")
+        diff_file.write(DIFF_REPORT_FOOTER)
+
+
+PLACEHOLDER_RE = re.compile("|".join(map(re.escape, PLACEHOLDER_TOKENS)))
+
+try:
+    # pyahocorasick escanea los seis placeholders en una sola pasada en C.
+    # Opcional: sin él se usa la alternación compilada de PLACEHOLDER_RE.
+    import ahocorasick as _ahocorasick
+
+    _PLACEHOLDER_AUTOMATON = _ahocorasick.Automaton()
+    for _token in PLACEHOLDER_TOKENS:
+        _PLACEHOLDER_AUTOMATON.add_word(_token, len(_token))
+    _PLACEHOLDER_AUTOMATON.make_automaton()
+except ImportError:
+    _PLACEHOLDER_AUTOMATON = None
+
+try:
+    # rapidfuzz calcula los opcodes en C (~20-100x más rápido que difflib
+    # sobre documentos largos). Opcional: sin él se usa SequenceMatcher.
+    from rapidfuzz.distance import Levenshtein as _Levenshtein
+except ImportError:
+    _Levenshtein = None
+
+
+def diff_opcodes(original_text: str, anonymized_text: str) -> List[Tuple[str, int, int, int, int]]:
+    if _Levenshtein is not None:
+        return [
+            (op.tag, op.src_start, op.src_end, op.dest_start, op.dest_end)
+            for op in _Levenshtein.opcodes(original_text, anonymized_text)
+        ]
+    matcher = SequenceMatcher(None, original_text, anonymized_text, autojunk=False)
+    return matcher.get_opcodes()
 
 
 def remove_placeholders(text: str) -> str:
-    cleaned = text
-    for token in PLACEHOLDER_TOKENS:
-        cleaned = cleaned.replace(token, "")
-    return cleaned
+    if _PLACEHOLDER_AUTOMATON is None:
+        return PLACEHOLDER_RE.sub("", text)
+
+    parts: List[str] = []
+    cursor = 0
+    for end, length in _PLACEHOLDER_AUTOMATON.iter(text):
+        start = end - length + 1
+        if start < cursor:
+            continue
+        parts.append(text[cursor:start])
+        cursor = end + 1
+    parts.append(text[cursor:])
+    return "".join(parts)
 
 
 def contains_placeholder(text: str) -> bool:
-    return any(token in text for token in PLACEHOLDER_TOKENS)
+    if _PLACEHOLDER_AUTOMATON is None:
+        return PLACEHOLDER_RE.search(text) is not None
+    return next(_PLACEHOLDER_AUTOMATON.iter(text), None) is not None
 
 
 def detect_suspicious_edits(
@@ -588,10 +1166,9 @@ def detect_suspicious_edits(
     anonymized_text: str,
     max_items: int = 10,
 ) -> List[Dict[str, str]]:
-    matcher = SequenceMatcher(None, original_text, anonymized_text)
     suspicious: List[Dict[str, str]] = []
 
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in diff_opcodes(original_text, anonymized_text):
         if tag == "equal":
             continue
 
@@ -639,7 +1216,7 @@ def run_anonymization(
     inference_cfg = config.get("inference", {})
     lm_cfg = config.get("lm_api", {})
 
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     text = ""
     chunks: List[Chunk] = []
     processed_chunks: List[str] = []
@@ -661,6 +1238,8 @@ def run_anonymization(
         "validation": {"status": "pending", "issues": []},
     }
 
+    client: Optional[LMStudioClient] = None
+
     try:
         client = LMStudioClient(
             base_url=lm_cfg["base_url"],
@@ -670,47 +1249,88 @@ def run_anonymization(
             logger=logger,
             max_retries=runtime_cfg.get("max_retries", 2),
             backoff_seconds=runtime_cfg.get("retry_backoff_seconds", 2.0),
+            pool_size=max(1, int(runtime_cfg.get("concurrency", 4))),
+            response_cache_dir=logger.logs_dir / "cache" / "llm",
         )
         logger.log_console("Verificando conexión con LM Studio...")
         client.check_health()
         logger.log_console("Conexión con LM Studio verificada.")
 
         ext = file_path.suffix.lower()
-        logger.log_console("Extrayendo texto del documento...")
-        if ext == ".pdf":
-            text = extract_text_from_pdf(file_path)
-        elif ext in {".doc", ".docx"}:
-            text = extract_text_from_docx(file_path)
+        cache_dir = logger.logs_dir / "cache"
+        file_key = file_sha256(file_path)
+        cached_text_path = cache_dir / f"{file_key}.txt"
+
+        cached_text = load_cached_text(cached_text_path)
+        if cached_text is not None:
+            text = cached_text
+            logger.log_console("Texto recuperado de la caché de extracción (documento ya procesado antes).")
         else:
-            raise ValueError(f"Formato de archivo no soportado: {ext}")
+            logger.log_console("Extrayendo texto del documento...")
+            if ext == ".pdf":
+                text = extract_text_from_pdf(file_path)
+            elif ext in {".doc", ".docx"}:
+                text = extract_text_from_docx(file_path)
+            else:
+                raise ValueError(f"Formato de archivo no soportado: {ext}")
+
+            if text.strip():
+                store_cached_text(cached_text_path, text)
 
         if not text.strip():
             raise ValueError("El archivo está vacío o no se pudo extraer texto legible.")
 
         logger.log_console(f"Caracteres extraídos: {len(text)}")
 
-        chunks = build_chunks(
-            text=text,
-            max_tokens=ensure_positive(chunk_cfg["max_context_tokens"], "max_context_tokens"),
-            overlap_tokens=max(0, chunk_cfg["overlap_tokens"]),
-            safety_factor=float(chunk_cfg.get("safety_factor", 0.85)),
-        )
-        logger.log_console(f"Documento dividido en {len(chunks)} chunks.")
+        # Caché de resultados completos: mismo documento + mismos parámetros
+        # de generación, prompt y chunking producen el mismo texto anonimizado,
+        # así que una recarga del archivo evita el pipeline entero (LLM incluido).
+        result_digest = anonymization_digest(client.payload_digest, chunk_cfg)
+        cached_result_path = cache_dir / f"{file_key}_{result_digest}.result.txt"
+        cached_result = load_cached_text(cached_result_path)
 
-        processed_chunks, failed_chunks = process_chunks(
-            chunks=chunks,
-            client=client,
-            logger=logger,
-            runtime_config=runtime_cfg,
-            progress_callback=progress_callback,
-        )
+        if cached_result is not None and cached_result.strip():
+            final_document = cached_result
+            logger.log_console(
+                "Documento anonimizado recuperado de la caché de resultados; se omite la llamada al modelo."
+            )
+            if progress_callback:
+                progress_callback(1, 1)
+        else:
+            cached_chunks_path = cache_dir / f"{file_key}_{chunking_digest(chunk_cfg)}.chunks.json"
+            cached_chunks = load_cached_chunks(cached_chunks_path, text)
+            if cached_chunks is not None:
+                chunks = cached_chunks
+                logger.log_console("Límites de chunks recuperados de la caché.")
+            else:
+                chunks = build_chunks(
+                    text=text,
+                    max_tokens=ensure_positive(chunk_cfg["max_context_tokens"], "max_context_tokens"),
+                    overlap_tokens=max(0, chunk_cfg["overlap_tokens"]),
+                    safety_factor=float(chunk_cfg.get("safety_factor", 0.85)),
+                )
+                store_cached_chunks(cached_chunks_path, chunks)
+            logger.log_console(f"Documento dividido en {len(chunks)} chunks.")
+
+            processed_chunks, failed_chunks = process_chunks(
+                chunks=chunks,
+                client=client,
+                logger=logger,
+                runtime_config=runtime_cfg,
+                progress_callback=progress_callback,
+            )
+
+            logger.log_console("Unificando chunks procesados...")
+            final_document = merge_chunks(chunks, processed_chunks)
+            logger.log_console(f"Documento final: {len(final_document)} caracteres.")
 
-        logger.log_console("Unificando chunks procesados...")
-        final_document = merge_chunks(chunks, processed_chunks)
-        logger.log_console(f"Documento final: {len(final_document)} caracteres.")
+            if not failed_chunks:
+                store_cached_text(cached_result_path, final_document)
 
-        with open(output_file, "w", encoding="utf-8") as output:
-            output.write(final_document)
+        # Codificar una sola vez y escribir en binario evita el re-encode por
+        # bloques del TextIOWrapper sobre documentos de varios MB.
+        with open(output_file, "wb", buffering=1 << 20) as output:
+            output.write(final_document.encode("utf-8"))
         logger.log_console(f"Documento anonimizado guardado en: {output_file}")
 
         length_metrics = calculate_length_metrics(text, final_document)
@@ -726,12 +1346,29 @@ def run_anonymization(
             f"diferencia: {length_metrics['delta']}. {ratio_msg}"
         )
 
-        try:
-            generate_diff_report(text, final_document, diff_report_file)
-            summary["diff_report_file"] = str(diff_report_file)
-            logger.log_console(f"Reporte de comparación generado en: {diff_report_file}")
-        except Exception as diff_exc:
-            logger.log_console(f"No se pudo generar el reporte de comparación: {diff_exc}", level="WARN")
+        diff_mode = str(runtime_cfg.get("diff_report", "auto")).lower()
+        diff_max_chars = int(runtime_cfg.get("diff_report_max_chars", 500_000))
+        generate_report = diff_mode == "always" or (diff_mode == "auto" and len(text) <= diff_max_chars)
+
+        diff_thread: Optional[threading.Thread] = None
+        diff_errors: List[str] = []
+        if generate_report:
+            # El reporte y la validación automática son independientes y ambos
+            # CPU-bound: se generan en paralelo.
+            def _diff_worker() -> None:
+                try:
+                    generate_diff_report(text, final_document, diff_report_file)
+                except Exception as diff_exc:
+                    diff_errors.append(str(diff_exc))
+
+            diff_thread = threading.Thread(target=_diff_worker, daemon=True)
+            diff_thread.start()
+        elif diff_mode == "never":
+            logger.log_console("Reporte de comparación desactivado por configuración.")
+        else:
+            logger.log_console(
+                f"Reporte de comparación omitido (documento supera {diff_max_chars} caracteres)."
+            )
 
         suspicious_edits = detect_suspicious_edits(text, final_document)
         if suspicious_edits:
@@ -751,13 +1388,21 @@ def run_anonymization(
             summary["validation"] = {"status": "ok", "issues": []}
             logger.log_console("Validación automática: sin diferencias no permitidas detectadas.")
 
+        if diff_thread is not None:
+            diff_thread.join()
+            if diff_errors:
+                logger.log_console(f"No se pudo generar el reporte de comparación: {diff_errors[0]}", level="WARN")
+            else:
+                summary["diff_report_file"] = str(diff_report_file)
+                logger.log_console(f"Reporte de comparación generado en: {diff_report_file}")
+
         summary.update(
             {
                 "output_file": str(output_file),
                 "diff_report_file": summary["diff_report_file"],
                 "total_chunks": len(chunks),
                 "failed_chunks": failed_chunks,
-                "processing_seconds": round(time.time() - start_time, 2),
+                "processing_seconds": round((time.perf_counter_ns() - start_ns) / 1e9, 2),
                 "status": "success",
             }
         )
@@ -769,7 +1414,7 @@ def run_anonymization(
                 "output_file": summary["output_file"],
                 "total_chunks": len(chunks),
                 "failed_chunks": failed_chunks,
-                "processing_seconds": round(time.time() - start_time, 2),
+                "processing_seconds": round((time.perf_counter_ns() - start_ns) / 1e9, 2),
                 "status": "error",
                 "error_message": str(exc),
             }
@@ -777,6 +1422,8 @@ def run_anonymization(
         if not summary.get("validation"):
             summary["validation"] = {"status": "error", "issues": []}
     finally:
+        if client is not None:
+            client.close()
         logger.finalize(summary)
 
     return summary
@@ -785,6 +1432,11 @@ def run_anonymization(
 # ==========================
 # 7. INTERFAZ GRÁFICA
 # ==========================
+# Separador de los campos de lista del formulario (coma o salto de línea),
+# compilado una sola vez en lugar de en cada lectura del formulario.
+_LIST_SPLIT_RE = re.compile(r"[,\n]+")
+
+
 class AnonymizerApp(tk.Tk):
     def __init__(self) -> None:
         super().__init__()
@@ -804,9 +1456,16 @@ class AnonymizerApp(tk.Tk):
         self.summary_var = tk.StringVar(value="")
 
         self.config_controls: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        self._summary_structure: Optional[List[str]] = None
+        self._summary_rendered: Dict[str, str] = {}
 
         self._build_ui()
-        self.after(200, self._process_log_queue)
+        # Drenado dirigido por eventos: los hilos de trabajo generan
+        # <<LogUpdate>> al encolar, así la GUI no sondea cada 200ms y el log
+        # aparece en pantalla en el siguiente turno del event loop. El after
+        # de 1s queda como red de seguridad.
+        self.bind("<<LogUpdate>>", self._on_log_update)
+        self.after(1000, self._process_log_queue)
 
     # --- Construcción de UI ---
     def _build_ui(self) -> None:
@@ -828,10 +1487,25 @@ class AnonymizerApp(tk.Tk):
         notebook.add(self.tab_logs, text="Registros")
         notebook.add(self.tab_about, text="Acerca de")
 
+        # La pestaña de configuración (canvas con scroll y decenas de widgets)
+        # y la de "Acerca de" se construyen recién al seleccionarlas: crear
+        # widgets es de lo más caro en Tk y muchos usuarios nunca las abren.
+        # Procesamiento y Registros se arman al inicio porque el drenado de la
+        # cola escribe en log_text desde el primer momento.
+        self._lazy_tabs: Dict[str, Callable[[], None]] = {
+            str(self.tab_config): self._build_config_tab,
+            str(self.tab_about): self._build_about_tab,
+        }
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
         self._build_processing_tab()
-        self._build_config_tab()
         self._build_logs_tab()
-        self._build_about_tab()
+
+    def _on_tab_changed(self, _event: "tk.Event[Any]") -> None:
+        selected = self.notebook.select()
+        builder = self._lazy_tabs.pop(selected, None)
+        if builder is not None:
+            builder()
 
     def _build_processing_tab(self) -> None:
         frame = self.tab_processing
@@ -934,6 +1608,10 @@ class AnonymizerApp(tk.Tk):
                     (("runtime", "max_retries"), "Reintentos", int),
                     (("runtime", "retry_backoff_seconds"), "Backoff entre reintentos (s)", float),
                     (("runtime", "abort_on_failure"), "Abortar ante fallos", bool),
+                    (("runtime", "concurrency"), "Chunks en paralelo", int),
+                    (("runtime", "chunk_batch_size"), "Chunks por llamada al modelo", int),
+                    (("runtime", "diff_report"), "Reporte de comparación (auto/always/never)", str),
+                    (("runtime", "diff_report_max_chars"), "Máx. caracteres para reporte auto", int),
                 ],
             ),
         ]
@@ -1052,7 +1730,13 @@ class AnonymizerApp(tk.Tk):
                 meta["var"].set(str(value))
 
     def _build_config_from_form(self) -> Dict[str, Any]:
-        new_config = copy.deepcopy(self.config_data)
+        # La configuración tiene dos niveles (sección -> escalar/lista) y cada
+        # control reemplaza su valor completo, así que basta copiar las
+        # secciones; copy.deepcopy recorría todos los valores en cada guardado.
+        new_config = {
+            key: (value.copy() if isinstance(value, dict) else value)
+            for key, value in self.config_data.items()
+        }
 
         for path, meta in self.config_controls.items():
             target = new_config
@@ -1068,7 +1752,7 @@ class AnonymizerApp(tk.Tk):
                     if not raw:
                         target[path[-1]] = []
                     else:
-                        parts = [item.strip() for item in re.split(r"[,\n]+", raw) if item.strip()]
+                        parts = [item.strip() for item in _LIST_SPLIT_RE.split(raw) if item.strip()]
                         target[path[-1]] = parts
                 elif field_type == int:
                     target[path[-1]] = int(meta["var"].get())
@@ -1155,6 +1839,7 @@ class AnonymizerApp(tk.Tk):
                     "error_message": str(exc),
                 }
             self.log_queue.put(("done", summary))
+            self._notify_log_update()
 
         self.processing_thread = threading.Thread(target=worker, daemon=True)
         self.processing_thread.start()
@@ -1167,21 +1852,48 @@ class AnonymizerApp(tk.Tk):
         self.summary_text.configure(state="normal")
         self.summary_text.delete("1.0", "end")
         self.summary_text.configure(state="disabled")
+        self._summary_structure = None
+        self._summary_rendered = {}
 
     def _clear_summary(self) -> None:
         self.summary_text.configure(state="normal")
         self.summary_text.delete("1.0", "end")
         self.summary_text.configure(state="disabled")
+        self._summary_structure = None
+        self._summary_rendered = {}
         self.status_var.set("Resumen limpiado.")
 
     # --- Gestores de logs y progreso ---
     def _enqueue_log_message(self, level: str, message: str) -> None:
         self.log_queue.put(("log", level, message))
+        self._notify_log_update()
 
     def _enqueue_progress(self, current: int, total: int) -> None:
         self.log_queue.put(("progress", current, total))
+        self._notify_log_update()
+
+    def _notify_log_update(self) -> None:
+        try:
+            self.event_generate("<<LogUpdate>>", when="tail")
+        except tk.TclError:
+            # La ventana puede estar cerrándose mientras los hilos terminan.
+            pass
+
+    def _on_log_update(self, _event: "tk.Event[Any]") -> None:
+        self._drain_log_queue()
 
     def _process_log_queue(self) -> None:
+        try:
+            self._drain_log_queue()
+        finally:
+            self.after(1000, self._process_log_queue)
+
+    def _drain_log_queue(self) -> None:
+        # Se drena todo lo pendiente acumulando los mensajes de log en una
+        # sola inserción al widget: cada insert+see provoca un redibujado de
+        # Tk, y en ráfagas de logs del modelo N mutaciones congelan la GUI.
+        pending_logs: List[str] = []
+        last_progress: Optional[Tuple[int, int]] = None
         try:
             while True:
                 item = self.log_queue.get_nowait()
@@ -1189,21 +1901,33 @@ class AnonymizerApp(tk.Tk):
 
                 if kind == "log":
                     _, level, message = item
-                    self._append_log(message)
+                    pending_logs.append(message)
                 elif kind == "progress":
-                    _, current, total = item
-                    self._update_progress(current, total)
+                    last_progress = (item[1], item[2])
                 elif kind == "done":
                     _, summary = item
+                    if pending_logs:
+                        self._append_log_batch(pending_logs)
+                        pending_logs = []
                     self._handle_completion(summary)
         except queue.Empty:
             pass
         finally:
-            self.after(200, self._process_log_queue)
+            if pending_logs:
+                self._append_log_batch(pending_logs)
+            if last_progress is not None:
+                self._update_progress(*last_progress)
 
-    def _append_log(self, message: str) -> None:
+    # El renderizado del Text de Tk se degrada con el número de líneas; las
+    # corridas largas pueden emitir decenas de miles, así que la vista se
+    # recorta a las últimas MAX_LOG_LINES (el archivo de log conserva todo).
+    MAX_LOG_LINES = 5000
+
+    def _append_log_batch(self, messages: List[str]) -> None:
         self.log_text.configure(state="normal")
-        self.log_text.insert("end", message + "\n")
+        self.log_text.insert("end", "\n".join(messages) + "\n")
+        if int(self.log_text.index("end-1c").split(".")[0]) > self.MAX_LOG_LINES:
+            self.log_text.delete("1.0", f"end - {self.MAX_LOG_LINES} lines")
         self.log_text.see("end")
         self.log_text.configure(state="disabled")
 
@@ -1230,7 +1954,7 @@ class AnonymizerApp(tk.Tk):
         else:
             self.status_var.set("Proceso finalizado con errores.")
 
-        lines = [
+        general_lines = [
             f"Run ID: {summary.get('run_id', '-') }",
             f"Archivo origen: {summary.get('source_file', '-') }",
             f"Estado: {summary.get('status', '-') }",
@@ -1240,45 +1964,50 @@ class AnonymizerApp(tk.Tk):
             f"Archivo de salida: {summary.get('output_file', '-') }",
         ]
 
+        metrics_lines: List[str] = []
         metrics = summary.get("length_metrics") or {}
         if metrics:
             ratio = metrics.get("ratio")
             ratio_text = f"{ratio:.2%}" if isinstance(ratio, (float, int)) and ratio is not None else "N/D"
-            lines.extend(
-                [
-                    f"Caracteres originales: {metrics.get('original_length', 0)}",
-                    f"Caracteres anonimizados: {metrics.get('anonymized_length', 0)}",
-                    f"Diferencia: {metrics.get('delta', 0)}",
-                    f"Relación anon/orig: {ratio_text}",
-                ]
-            )
-
+            metrics_lines = [
+                f"Caracteres originales: {metrics.get('original_length', 0)}",
+                f"Caracteres anonimizados: {metrics.get('anonymized_length', 0)}",
+                f"Diferencia: {metrics.get('delta', 0)}",
+                f"Relación anon/orig: {ratio_text}",
+            ]
+
+        validation_lines: List[str] = []
         validation = summary.get("validation") or {}
         if validation:
-            lines.append(f"Validación automática: {validation.get('status', 'N/D')}")
+            validation_lines.append(f"Validación automática: {validation.get('status', 'N/D')}")
             issues = validation.get("issues") or []
             for issue in issues[:3]:
                 original_snippet = issue.get("original", "")[:80]
                 anonymized_snippet = issue.get("anon", "")[:80]
-                lines.append(
+                validation_lines.append(
                     " - "
                     f"tipo={issue.get('type', '-')}, original='{original_snippet}', "
                     f"anon='{anonymized_snippet}'"
                 )
             if len(issues) > 3:
-                lines.append(f" - ... {len(issues) - 3} diferencias adicionales")
+                validation_lines.append(f" - ... {len(issues) - 3} diferencias adicionales")
 
+        extra_lines: List[str] = []
         diff_report_path = summary.get("diff_report_file")
         if diff_report_path:
-            lines.append(f"Reporte de comparación: {diff_report_path}")
+            extra_lines.append(f"Reporte de comparación: {diff_report_path}")
 
         if "error_message" in summary:
-            lines.append(f"Error: {summary['error_message']}")
+            extra_lines.append(f"Error: {summary['error_message']}")
 
-        self.summary_text.configure(state="normal")
-        self.summary_text.delete("1.0", "end")
-        self.summary_text.insert("1.0", "\n".join(lines))
-        self.summary_text.configure(state="disabled")
+        self._render_summary(
+            {
+                "general": "\n".join(general_lines),
+                "metrics": "\n".join(metrics_lines),
+                "validation": "\n".join(validation_lines),
+                "extra": "\n".join(extra_lines),
+            }
+        )
 
         if status != "success":
             messagebox.showerror("Anonimización con errores", summary.get("error_message", "Error no especificado."))
@@ -1288,6 +2017,33 @@ class AnonymizerApp(tk.Tk):
                 "Se detectaron diferencias no esperadas. Revisa el reporte de comparación.",
             )
 
+    def _render_summary(self, sections: Dict[str, str]) -> None:
+        # El resumen se escribe por secciones etiquetadas: entre corridas de
+        # una misma sesión sólo se reemplaza el rango de las secciones que
+        # cambiaron, en lugar de reconstruir (y reflowear) todo el widget.
+        widget = self.summary_text
+        structure = [name for name, text in sections.items() if text]
+        widget.configure(state="normal")
+
+        if structure != self._summary_structure:
+            widget.delete("1.0", "end")
+            for name in structure:
+                widget.insert("end", sections[name] + "\n", (f"sec_{name}",))
+            self._summary_structure = structure
+            self._summary_rendered = {name: sections[name] for name in structure}
+        else:
+            for name in structure:
+                text = sections[name]
+                if self._summary_rendered.get(name) == text:
+                    continue
+                tag = f"sec_{name}"
+                first, last = widget.tag_ranges(tag)
+                widget.delete(first, last)
+                widget.insert(first, text + "\n", (tag,))
+                self._summary_rendered[name] = text
+
+        widget.configure(state="disabled")
+
     # --- Utilidades de GUI ---
     def _open_logs_dir(self) -> None:
         logs_dir = resolve_logs_dir(self.config_data.get("runtime", {}))